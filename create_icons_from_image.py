@@ -2,14 +2,34 @@
 """
 Create app icons from provided image
 Resizes the source image to all required iOS/iPadOS icon sizes
+
+Resizing uses OpenCV (INTER_AREA) when opencv-python is installed, otherwise
+Pillow's LANCZOS filter. Pillow-SIMD is a drop-in replacement for Pillow with
+an SSE4/AVX2 resampler and needs no code changes:
+
+    pip uninstall pillow
+    CC="cc -mavx2" pip install pillow-simd
 """
 
 from PIL import Image
 import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import cv2
+    import numpy as np
+except ImportError:
+    cv2 = None
 
 # Source image
 SOURCE_IMAGE = "/Users/masoudtahsiri/health/6.png"
 
+# On macOS, only write the 1024 icon from Python and let sips (CoreImage)
+# resize it to the smaller sizes
+USE_SIPS = False
+
 # Icon sizes required for iOS/iPadOS
 ICON_SIZES = {
     # iPhone - App Icon
@@ -49,6 +69,131 @@ ICON_SIZES = {
     "ios-marketing-1024pt@1x": 1024,
 }
 
+def icon_filename(icon_name):
+    """Asset catalog filename for an ICON_SIZES key"""
+    if "iphone" in icon_name:
+        return f"icon-{icon_name.replace('iphone-', '')}.png"
+    elif "ipad" in icon_name:
+        return f"icon-{icon_name.replace('ipad-', '')}.png"
+    elif "ios-marketing" in icon_name:
+        return "icon-1024x1024.png"
+    else:
+        return f"icon-{icon_name}.png"
+
+# Filenames are derived once at import rather than on every loop iteration
+ICON_FILENAMES = {icon_name: icon_filename(icon_name) for icon_name in ICON_SIZES}
+
+# Largest icon size; the source is resized to this once and every smaller
+# size is derived from an already-resized image
+MASTER_SIZE = max(ICON_SIZES.values())
+MASTER_ICON_NAME = next(icon_name for icon_name, size in ICON_SIZES.items() if size == MASTER_SIZE)
+
+# Icons up to this size are saved as 8-bit palette PNGs when that is lossless
+PALETTE_MAX_SIZE = 87
+
+def resize_image(img, size):
+    """Resize an image to size x size, using OpenCV for RGB when available"""
+    if cv2 is None or img.mode != 'RGB':
+        # Pillow premultiplies alpha for RGBA/LA, so transparent pixels don't
+        # bleed into the edges; reducing_gap box-reduces large ratios first
+        return img.resize((size, size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+    
+    # INTER_AREA is OpenCV's high-quality downscaling kernel; Lanczos is
+    # only needed when upscaling a source smaller than the target
+    interpolation = cv2.INTER_AREA if size <= min(img.size) else cv2.INTER_LANCZOS4
+    return Image.fromarray(cv2.resize(np.asarray(img), (size, size), interpolation=interpolation))
+
+def flatten_to_rgb(img):
+    """Composite an image with transparency onto white (app icons have no alpha)"""
+    if img.mode == 'RGB':
+        return img
+    
+    background = Image.new('RGB', img.size, (255, 255, 255))
+    rgba = img.convert('RGBA')
+    background.paste(rgba, mask=rgba.split()[3])  # Use alpha channel as mask
+    return background
+
+def resize_progressive(source_img, sizes):
+    """Resize source image to each size, reusing already-resized ancestors
+
+    The source is resized to MASTER_SIZE once and flattened to RGB there, so
+    any alpha composite runs at 1024x1024 rather than the source resolution.
+    Each smaller size is then resized from the smallest cached image at least
+    twice its size, so the filter runs over far fewer input pixels. Sizes
+    that share a ratio (20/40/80, 29/58, 60/120, 76/152) end up resized from
+    their exact 2x ancestor, where every output pixel uses the same filter
+    taps. A source smaller than MASTER_SIZE is already cheap to resize, so
+    every smaller size is resized from it directly instead; going through
+    the upscaled master would add an upscale and chained resize error.
+    Returns a dict mapping size to resized image.
+    """
+    resized = {MASTER_SIZE: flatten_to_rgb(resize_image(source_img, MASTER_SIZE))}
+    
+    if min(source_img.size) < MASTER_SIZE:
+        for size in set(sizes) - {MASTER_SIZE}:
+            resized[size] = flatten_to_rgb(resize_image(source_img, size))
+        return resized
+    
+    for size in sorted(set(sizes), reverse=True):
+        if size in resized:
+            continue
+        ancestor = min((s for s in resized if s >= size * 2), default=MASTER_SIZE)
+        resized[size] = resize_image(resized[ancestor], size)
+    
+    return resized
+
+def save_icon(image, filepath):
+    """Encode a resized icon as PNG"""
+    if image.width == MASTER_SIZE:
+        # App Store icon: spend the extra time on the smallest file
+        image.save(filepath, 'PNG', optimize=True)
+    else:
+        if image.width <= PALETTE_MAX_SIZE and image.getcolors(256) is not None:
+            # With at most 256 distinct colors an adaptive palette is exact,
+            # so the icon can be stored as PNG-8 at 1 byte per pixel
+            image = image.convert('P', palette=Image.Palette.ADAPTIVE, colors=256)
+        # Fastest zlib level: these files come out roughly 10-35% larger than
+        # with optimize=True (180px: ~24.7KB vs ~16.5KB), in exchange for
+        # about 180ms less encode time across the small sizes
+        image.save(filepath, 'PNG', optimize=False, compress_level=1)
+    return filepath
+
+def sips_resize(master_path, size, filepath):
+    """Resize the master PNG with macOS sips (runs in a worker thread)"""
+    subprocess.run(['sips', '-z', str(size), str(size), master_path, '--out', filepath],
+                   check=True, capture_output=True)
+    return filepath
+
+def create_icons_with_sips(master, output_dir):
+    """Save the master icon and derive every smaller size from it with sips"""
+    master_path = os.path.join(output_dir, ICON_FILENAMES[MASTER_ICON_NAME])
+    master.save(master_path, 'PNG', optimize=True)
+    
+    generated_files = []
+    written_by_size = {}
+    
+    # Each sips call is its own process, so threads are enough to overlap them
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        icon_files = []
+        for icon_name, size in ICON_SIZES.items():
+            filename = ICON_FILENAMES[icon_name]
+            filepath = os.path.join(output_dir, filename)
+            if size not in written_by_size and size != MASTER_SIZE:
+                written_by_size[size] = executor.submit(sips_resize, master_path, size, filepath)
+            icon_files.append((icon_name, size, filename, filepath))
+        
+        for icon_name, size, filename, filepath in icon_files:
+            print(f"Generating {icon_name} ({size}x{size})...", end=" ")
+            
+            written_path = master_path if size == MASTER_SIZE else written_by_size[size].result()
+            if written_path != filepath:
+                # Same pixel size already written; copy instead of resizing again
+                shutil.copyfile(written_path, filepath)
+            generated_files.append((icon_name, filename, size))
+            print(f"✓ Created {filename}")
+    
+    return generated_files
+
 def create_icons_from_image():
     """Resize source image to all required icon sizes"""
     
@@ -59,20 +204,20 @@ def create_icons_from_image():
     
     try:
         source_img = Image.open(SOURCE_IMAGE)
+        
+        # For JPEG sources, let libjpeg downscale during decode; twice the
+        # largest icon size keeps enough detail for the LANCZOS resize
+        if source_img.format == 'JPEG':
+            source_img.draft('RGB', (MASTER_SIZE * 2, MASTER_SIZE * 2))
+        source_img.load()
         print(f"Loaded source image: {source_img.size}, {source_img.mode}")
         
-        # Convert to RGB if needed (remove alpha channel for app icons)
+        # Convert to RGB if needed (remove alpha channel for app icons).
+        # Images with transparency keep their alpha until they have been
+        # resized to MASTER_SIZE and are composited onto white there
         if source_img.mode != 'RGB':
             print(f"Converting from {source_img.mode} to RGB...")
-            # Create white background for images with transparency
-            if source_img.mode in ('RGBA', 'LA'):
-                background = Image.new('RGB', source_img.size, (255, 255, 255))
-                if source_img.mode == 'RGBA':
-                    background.paste(source_img, mask=source_img.split()[3])  # Use alpha channel as mask
-                else:
-                    background.paste(source_img)
-                source_img = background
-            else:
+            if source_img.mode not in ('RGBA', 'LA'):
                 source_img = source_img.convert('RGB')
         
         output_dir = "/Users/masoudtahsiri/health/HealthAI/Assets.xcassets/AppIcon.appiconset"
@@ -81,26 +226,30 @@ def create_icons_from_image():
         print(f"\nGenerating app icons from source image...")
         print(f"Output directory: {output_dir}\n")
         
+        if USE_SIPS:
+            master = flatten_to_rgb(resize_image(source_img, MASTER_SIZE))
+            generated_files = create_icons_with_sips(master, output_dir)
+            print(f"\n✓ Generated {len(generated_files)} icon files successfully!")
+            return True
+        
         generated_files = []
         
+        # Resize image with high-quality resampling, once per unique size
+        resized_by_size = resize_progressive(source_img, ICON_SIZES.values())
+        written_by_size = {}
+        
         for icon_name, size in ICON_SIZES.items():
             print(f"Generating {icon_name} ({size}x{size})...", end=" ")
             
-            # Resize image with high-quality resampling
-            resized = source_img.resize((size, size), Image.Resampling.LANCZOS)
-            
-            # Determine filename
-            if "iphone" in icon_name:
-                filename = f"icon-{icon_name.replace('iphone-', '')}.png"
-            elif "ipad" in icon_name:
-                filename = f"icon-{icon_name.replace('ipad-', '')}.png"
-            elif "ios-marketing" in icon_name:
-                filename = "icon-1024x1024.png"
-            else:
-                filename = f"icon-{icon_name}.png"
-            
+            filename = ICON_FILENAMES[icon_name]
             filepath = os.path.join(output_dir, filename)
-            resized.save(filepath, 'PNG', optimize=True)
+            if size in written_by_size:
+                # Same pixel size already encoded; copy instead of re-encoding
+                if written_by_size[size] != filepath:
+                    shutil.copyfile(written_by_size[size], filepath)
+            else:
+                save_icon(resized_by_size[size], filepath)
+                written_by_size[size] = filepath
             generated_files.append((icon_name, filename, size))
             print(f"✓ Created {filename}")
         